@@ -1,16 +1,40 @@
 # main.py
 from fastapi import FastAPI, HTTPException
+from fastapi.responses import ORJSONResponse # Faster JSON encoding for every response
 from pydantic import BaseModel, Field # For data validation and request/response models
 from typing import List, Dict, Optional
-from textblob import TextBlob # For sentiment analysis
+from collections import Counter
+from functools import lru_cache
+from array import array # Compact typed columns for the ticket store
+from textblob.en import polarity as text_polarity # TextBlob's pattern lexicon scorer, for sentiment analysis
+import ahocorasick # For single-pass multi-keyword FAQ matching
 import re # For regular expressions (intent recognition)
-import uuid # For generating unique ticket IDs
+import threading
+import time
+import secrets # For generating unique ticket IDs
 
 # --- Initialize FastAPI App ---
 app = FastAPI(
     title="Customer Support Helper API",
     description="An API to assist with customer support tasks, including FAQ, ticket submission with sentiment analysis, and basic intent actions.",
     version="0.1.0",
+    default_response_class=ORJSONResponse,
+)
+
+# --- Precompiled Patterns (compiled once at import instead of per request) ---
+# Single alternation for all intents, so the query is scanned once.
+# Matched against the lowercased query, so no IGNORECASE is needed.
+_INTENT_RE = re.compile(
+    r"(?P<track>(?:track|status of|where is) my order\s*(?P<order_id>[a-z0-9]+))"
+    r"|(?P<greet>\b(?:hello|hi|hey|good morning|good afternoon)\b)"
+)
+# Words that must directly precede "my order" in a track request
+_TRACK_VERBS = ("track", "status of", "where is")
+# Greeting words followed by a word boundary, for a startswith() check before the regex
+_GREETING_PREFIXES = tuple(
+    greeting + boundary
+    for greeting in ("hello", "hi", "hey", "good morning", "good afternoon")
+    for boundary in (" ", "!", ".", ",", "?")
 )
 
 # --- In-Memory Data Stores (for simplicity, replace with a database in a real application) ---
@@ -38,8 +62,37 @@ faq_database: Dict[str, Dict[str, str]] = {
     }
 }
 
+# Keyword automaton over every FAQ keyword, built once so a query is scanned in a single pass.
+# Each keyword maps to the FAQ ids that list it (a keyword may be shared by several FAQs).
+# Keywords are lowercased here, as queries are, so matching is case-insensitive however they are written.
+_faq_keyword_owners: Dict[str, List[str]] = {}
+for _faq_id, _faq_item in faq_database.items():
+    for _keyword in _faq_item["keywords"]:
+        _faq_keyword_owners.setdefault(_keyword.lower(), []).append(_faq_id)
+
+_FAQ_AUTOMATON = ahocorasick.Automaton()
+for _keyword, _owners in _faq_keyword_owners.items():
+    _FAQ_AUTOMATON.add_word(_keyword, (_keyword, tuple(_owners)))
+_FAQ_AUTOMATON.make_automaton()
+
+# Position of each FAQ, used to break score ties in favour of the FAQ defined first
+_faq_order: Dict[str, int] = {faq_id: i for i, faq_id in enumerate(faq_database)}
+
 # 2. Support Tickets
-support_tickets_db: Dict[str, Dict] = {} # Stores tickets, key is ticket_id
+# Stored column-wise (one list/array per field) instead of one dict per ticket.
+# Row i of every column belongs to the same ticket; _ticket_index maps ticket_id -> row.
+_ticket_ids: List[str] = []
+_user_emails: List[str] = []
+_issue_desc: List[str] = []
+_statuses: List[str] = []
+_sentiment = array("b") # SENT_NEG, SENT_NEU or SENT_POS
+_timestamps = array("q") # UTC epoch nanoseconds
+_ticket_index: Dict[str, int] = {}
+_ticket_lock = threading.Lock() # Endpoints run on a threadpool; keeps every column on the same row
+
+# Sentiment codes (fit in one signed byte); mapped to labels only when a ticket is serialized
+SENT_POS, SENT_NEG, SENT_NEU = 1, -1, 0
+_SENTIMENT_LABELS = ("negative", "neutral", "positive") # Indexed by code + 1
 
 # --- Pydantic Models (for Request and Response Data Validation) ---
 class FAQQuery(BaseModel):
@@ -69,65 +122,134 @@ class ActionResponse(BaseModel):
     entities: Dict[str, str] = {}
     message: str
 
+# --- Canned Responses (invariant, so built once instead of per request) ---
+_FAQ_NOT_FOUND = FAQResponse(answer="I'm sorry, I couldn't find an answer related to your query. Please try rephrasing or check our full FAQ page.")
+
+# Treat as read-only: returned as-is for every unrecognized query
+_UNKNOWN_INTENT: Dict = {
+    "intent": "unknown",
+    "entities": {},
+    "message": "I'm not sure how to help with that. Can you try rephrasing or ask about FAQs, order tracking, or submitting a ticket?"
+}
+
 # --- Helper Functions (AI-like features) ---
 
-def get_sentiment(text: str) -> str:
+def get_sentiment(text: str) -> int:
     """
     Analyzes the sentiment of a given text.
-    Returns 'positive', 'negative', or 'neutral'.
+    Returns SENT_POS, SENT_NEG, or SENT_NEU.
     """
-    blob = TextBlob(text)
-    polarity = blob.sentiment.polarity
+    # Same lexicon score as TextBlob(text).sentiment.polarity, without building a
+    # TextBlob (and its stripped copy and Sentiment namedtuple class) per ticket
+    polarity = text_polarity(text)
     if polarity > 0.1:
-        return "positive"
+        return SENT_POS
     elif polarity < -0.1:
-        return "negative"
+        return SENT_NEG
     else:
-        return "neutral"
+        return SENT_NEU
+
+@lru_cache(maxsize=4096)
+def _find_faq_cached(normalized_query: str) -> Optional[str]:
+    """
+    Returns the id of the best-matching FAQ for an already stripped and lowercased query.
+    Cached, since faq_database does not change while the app is running.
+    """
+    scores: Counter = Counter()
+    matched_keywords = set()
+    for _end, (keyword, faq_ids) in _FAQ_AUTOMATON.iter(normalized_query):
+        # Each keyword counts once, however often it appears in the query
+        if keyword not in matched_keywords:
+            matched_keywords.add(keyword)
+            scores.update(faq_ids)
+
+    if not scores: # Require at least one keyword match
+        return None
+
+    # Prioritize if more keywords match; on a tie, the FAQ defined first wins
+    return max(scores, key=lambda faq_id: (scores[faq_id], -_faq_order[faq_id]))
 
 def find_faq_answer(user_query: str) -> Optional[Dict[str, str]]:
     """
     Finds an FAQ answer based on keyword matching.
     """
-    user_query_lower = user_query.lower()
-    best_match_score = 0
-    best_faq_id = None
-
-    for faq_id, faq_item in faq_database.items():
-        current_score = 0
-        for keyword in faq_item["keywords"]:
-            if keyword in user_query_lower:
-                current_score += 1
-        
-        # Prioritize if more keywords match
-        if current_score > best_match_score:
-            best_match_score = current_score
-            best_faq_id = faq_id
-        # Basic tie-breaking: if same score, prefer shorter query matches (not implemented here for simplicity)
+    faq_id = _find_faq_cached(user_query.strip().lower())
+    return faq_database[faq_id] if faq_id else None
 
-    if best_faq_id and best_match_score > 0: # Require at least one keyword match
-        return faq_database[best_faq_id]
-    return None
+def _format_timestamp(timestamp_ns: int) -> str:
+    """
+    Formats UTC epoch nanoseconds as an ISO 8601 string with a 'Z' suffix.
+    """
+    seconds, nanoseconds = divmod(timestamp_ns, 1_000_000_000)
+    return "%s.%06dZ" % (time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(seconds)), nanoseconds // 1000)
+
+def _store_ticket(ticket_id: str, user_email: str, issue_description: str, sentiment: int, timestamp_ns: int) -> int:
+    """
+    Appends a ticket to the ticket columns and returns its row.
+    """
+    with _ticket_lock:
+        row = len(_ticket_ids)
+        _ticket_ids.append(ticket_id)
+        _user_emails.append(user_email)
+        _issue_desc.append(issue_description)
+        _statuses.append("submitted")
+        _sentiment.append(sentiment)
+        _timestamps.append(timestamp_ns)
+        _ticket_index[ticket_id] = row # Indexed last, so a ticket is never visible half-written
+    return row
+
+def _load_ticket(row: int) -> Dict[str, str]:
+    """
+    Gathers one ticket's fields from the ticket columns.
+    """
+    return {
+        "ticket_id": _ticket_ids[row],
+        "user_email": _user_emails[row],
+        "issue_description": _issue_desc[row],
+        "status": _statuses[row],
+        "sentiment": _SENTIMENT_LABELS[_sentiment[row] + 1],
+        "timestamp": _format_timestamp(_timestamps[row])
+    }
 
 def recognize_intent_and_extract_entities(user_query: str) -> Dict:
     """
     Recognizes basic intents and extracts entities using regex.
     """
     user_query_lower = user_query.lower()
-    
-    # Intent: Track Order
-    track_order_match = re.search(r"(track|status of|where is) my order\s*([A-Z0-9]+)", user_query, re.IGNORECASE)
-    if track_order_match:
-        order_id = track_order_match.group(2).upper()
+    order_id = None
+    greeting_found = False
+
+    # Fast path for "<verb> my order <id>": every track match contains " my order", so if its
+    # first occurrence follows a verb and precedes a plain alphanumeric id, the regex would find the same id
+    head, sep, tail = user_query_lower.partition(" my order")
+    if sep and head.endswith(_TRACK_VERBS):
+        order_token = tail.split(None, 1)
+        if order_token and order_token[0].isascii() and order_token[0].isalnum():
+            order_id = order_token[0]
+
+    if order_id is None:
+        # Fast path: a query that opens with a greeting and never mentions an order
+        # cannot be a track request, so the regex does not need to run
+        greeting_found = user_query_lower.startswith(_GREETING_PREFIXES) and "order" not in user_query_lower
+
+    if order_id is None and not greeting_found:
+        for intent_match in _INTENT_RE.finditer(user_query_lower):
+            # Intent: Track Order (takes priority over a greeting anywhere in the query)
+            if intent_match.lastgroup == "track":
+                order_id = intent_match.group("order_id")
+                break
+            # Intent: General Greeting (keep scanning in case an order is mentioned later)
+            greeting_found = True
+
+    if order_id is not None:
+        order_id = order_id.upper()
         return {
             "intent": "track_order",
             "entities": {"order_id": order_id},
             "message": f"Fetching status for order {order_id}..." # Placeholder
         }
 
-    # Intent: General Greeting
-    greeting_match = re.search(r"\b(hello|hi|hey|good morning|good afternoon)\b", user_query_lower)
-    if greeting_match:
+    if greeting_found:
         return {
             "intent": "greeting",
             "entities": {},
@@ -135,62 +257,51 @@ def recognize_intent_and_extract_entities(user_query: str) -> Dict:
         }
         
     # Default/Unknown Intent
-    return {
-        "intent": "unknown",
-        "entities": {},
-        "message": "I'm not sure how to help with that. Can you try rephrasing or ask about FAQs, order tracking, or submitting a ticket?"
-    }
+    return _UNKNOWN_INTENT
 
 
 # --- API Endpoints ---
 
 @app.post("/support/faq", response_model=FAQResponse, tags=["FAQ Support"])
-async def get_faq(query: FAQQuery):
+def get_faq(query: FAQQuery):
     """
     Provides an answer to a frequently asked question based on the user's query.
     """
     faq_item = find_faq_answer(query.query)
     if faq_item:
-        return FAQResponse(matched_question=faq_item["question"], answer=faq_item["answer"])
+        # Fields come from faq_database, so validation can be skipped
+        return FAQResponse.model_construct(matched_question=faq_item["question"], answer=faq_item["answer"])
     else:
-        return FAQResponse(answer="I'm sorry, I couldn't find an answer related to your query. Please try rephrasing or check our full FAQ page.")
+        return _FAQ_NOT_FOUND
 
 @app.post("/support/ticket", response_model=TicketResponse, status_code=201, tags=["Ticket Support"])
-async def submit_ticket(ticket_input: TicketInput):
+def submit_ticket(ticket_input: TicketInput):
     """
     Submits a new support ticket.
     The issue description will be analyzed for sentiment.
     """
-    ticket_id = str(uuid.uuid4()) # Generate a unique ticket ID
+    ticket_id = secrets.token_hex(16) # Generate a unique ticket ID (32 hex chars)
     sentiment = get_sentiment(ticket_input.issue_description)
+    timestamp_ns = time.time_ns()
+
+    row = _store_ticket(ticket_id, ticket_input.user_email, ticket_input.issue_description, sentiment, timestamp_ns)
     
-    from datetime import datetime
-    timestamp = datetime.utcnow().isoformat() + "Z"
-
-    new_ticket = {
-        "ticket_id": ticket_id,
-        "user_email": ticket_input.user_email,
-        "issue_description": ticket_input.issue_description,
-        "status": "submitted",
-        "sentiment": sentiment,
-        "timestamp": timestamp
-    }
-    support_tickets_db[ticket_id] = new_ticket
-    
-    return TicketResponse(**new_ticket)
+    # Built from already-validated input and server-generated fields, so validation can be skipped
+    return TicketResponse.model_construct(**_load_ticket(row))
 
 @app.get("/support/tickets/{ticket_id}", response_model=TicketResponse, tags=["Ticket Support"])
-async def get_ticket_status(ticket_id: str):
+def get_ticket_status(ticket_id: str):
     """
     Retrieves the details and status of a specific support ticket.
     """
-    if ticket_id not in support_tickets_db:
+    row = _ticket_index.get(ticket_id)
+    if row is None:
         raise HTTPException(status_code=404, detail="Ticket not found")
-    return TicketResponse(**support_tickets_db[ticket_id])
+    return TicketResponse.model_construct(**_load_ticket(row))
 
 
 @app.post("/support/action", response_model=ActionResponse, tags=["Intent Actions"])
-async def perform_action(query: ActionQuery):
+def perform_action(query: ActionQuery):
     """
     Recognizes user intent from a query and provides a relevant response or action.
     Currently supports 'track_order' and basic 'greeting'.
@@ -203,17 +314,18 @@ async def perform_action(query: ActionQuery):
         # In a real app, you would query a database here
         result["message"] = f"Mocked: Order {order_id} is currently out for delivery. Estimated arrival: Tomorrow."
         
-    return ActionResponse(**result)
+    return ActionResponse.model_construct(**result)
 
 # --- To run this API: ---
 # 1. Save this code as main.py
-# 2. Install dependencies: pip install fastapi uvicorn python-multipart textblob
+# 2. Install dependencies: pip install fastapi uvicorn python-multipart textblob pyahocorasick orjson
 #    (python-multipart is good to have for FastAPI, though not strictly used for JSON APIs here)
 #    (Make sure to install TextBlob corpora: python -m textblob.download_corpora)
 # 3. Run Uvicorn server: uvicorn main:app --reload
 # 4. Access the interactive API docs at http://127.0.0.1:8000/docs
 
-# Example of how to add a new FAQ:
+# Example of how to add a new FAQ (add it inside the faq_database literal above so its
+# keywords are included when the keyword automaton is built at import time):
 # faq_database["new_feature_faq"] = {
 #     "keywords": ["new feature", "latest update", "how to use x"],
 #     "question": "How do I use the new X feature?",